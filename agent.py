@@ -1,6 +1,8 @@
 import asyncio
+import functools
 import json
 import logging
+import math
 import os
 from pathlib import Path
 from typing import Optional
@@ -32,6 +34,21 @@ OBSTACLE_MODE_TOPIC = "obstacle-mode"
 OBSTACLE_FRAME_TOPIC = "obstacle-frame"
 OBSTACLE_DATA_TOPIC = "obstacle"
 
+# Obstacle frames larger than this are dropped unread (the app caps them at 14KB; LiveKit's limit is ~15KB)
+OBSTACLE_FRAME_MAX_BYTES = 16 * 1024
+# JPEG signature (SOI marker + first marker byte); raw frames must start with it
+JPEG_MAGIC = b"\xff\xd8\xff"
+# The same signature in base64, for frames from older app builds; anything else is not a JPEG frame
+JPEG_BASE64_PREFIX = "/9j/"
+
+
+@functools.lru_cache(maxsize=128)
+def _obstacle_payload(detected: bool, description: str) -> bytes:
+    """Encoded message for the obstacle topic. Descriptions come from the detector's fixed class
+    names, so each distinct message (including "path clear") is serialized only once."""
+    return json.dumps({"detected": detected, "description": description}).encode("utf-8")
+
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("agent")
@@ -137,9 +154,8 @@ async def my_agent(ctx: agents.JobContext):
 
     async def _publish_obstacle(detected: bool, description: str = "") -> None:
         try:
-            payload = json.dumps({"detected": detected, "description": description})
             await room.local_participant.publish_data(
-                payload.encode("utf-8"),
+                _obstacle_payload(detected, description),
                 topic=OBSTACLE_DATA_TOPIC,
                 reliable=True,
             )
@@ -195,6 +211,9 @@ async def my_agent(ctx: agents.JobContext):
                         heading = float(heading)
                     except (TypeError, ValueError):
                         heading = None
+                    # json.loads accepts NaN/Infinity; a non-finite compass reading counts as no heading
+                    if heading is not None and not math.isfinite(heading):
+                        heading = None
                 nav_tool.set_latest_gps(lat, lng, heading)
                 if nav_tool.session.active_route:
                     packet_heading = heading
@@ -239,14 +258,27 @@ async def my_agent(ctx: agents.JobContext):
         elif topic == OBSTACLE_FRAME_TOPIC:
             nonlocal obstacle_frames_received
             try:
-                data = packet.data.decode("utf-8")
-                if data.strip().startswith("{"):
-                    obj = json.loads(data)
-                    b64 = (obj.get("frame") or "").strip()
-                else:
-                    b64 = data.strip()
-                if not b64:
+                data = packet.data
+                if len(data) > OBSTACLE_FRAME_MAX_BYTES:
+                    logger.debug("obstacle-frame dropped: %d bytes > %d", len(data), OBSTACLE_FRAME_MAX_BYTES)
                     return
+                if data[:3] == JPEG_MAGIC:
+                    # Current app: raw JPEG bytes, handed to the decoder as-is (no base64 hop)
+                    frame = data
+                else:
+                    # Older app builds: {"frame": "<base64>"} or bare base64. json.loads takes the
+                    # bytes directly, so the payload is not copied into an intermediate str first
+                    if data.lstrip()[:1] == b"{":
+                        obj = json.loads(data)
+                        frame = (obj.get("frame") or "").strip()
+                    else:
+                        frame = data.strip().decode("ascii")
+                    if not frame:
+                        return
+                    # Reject non-JPEG payloads here, before they can displace a real frame in the processor queue
+                    if not frame.startswith(JPEG_BASE64_PREFIX):
+                        logger.debug("obstacle-frame dropped: not a base64 JPEG (starts %r)", frame[:8])
+                        return
                 obstacle_frames_received += 1
                 if obstacle_frames_received <= 3 or obstacle_frames_received % 20 == 0:
                     logger.info("obstacle-frame received (total=%d, payload_len=%d)", obstacle_frames_received, len(data))
@@ -255,7 +287,7 @@ async def my_agent(ctx: agents.JobContext):
                     _start_obstacle_processor()
                     logger.info("obstacle processor started from first frame (obstacle-mode may have arrived before agent)")
                 if obstacle_processor:
-                    obstacle_processor.put_frame(b64)
+                    obstacle_processor.put_frame(frame)
             except Exception as e:
                 logger.warning("obstacle-frame parse error: %s", e)
 
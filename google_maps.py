@@ -1,14 +1,16 @@
 import asyncio
 import os
 import logging
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
 import googlemaps
 import requests
+from pydantic import BaseModel
 from livekit.agents import llm
-from navigation import NavigationSession, _rewrite_instruction_with_heading
+from navigation import NavigationSession, _bearing_to_cardinal, _rewrite_instruction_with_heading
 from google.genai import Client
 from google.genai import types
 
@@ -24,6 +26,62 @@ logger = logging.getLogger("google_maps")
 # Topic for GPS data messages from the phone (must match Flutter publishData topic)
 GPS_DATA_TOPIC = "gps"
 
+# Persistent HTTP session shared by the Places API calls and every googlemaps.Client, so
+# Directions/Geocoding/Places reuse one pool of kept-alive TLS connections to Google.
+# Sized for the few concurrent blocking calls the agent makes through asyncio.to_thread.
+_http_session = requests.Session()
+_http_session.mount(
+    "https://",
+    requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16),
+)
+
+# Gemini client shared by every NavigationTool so its HTTP connection pool survives across sessions
+_genai_client: Optional[Client] = None
+_genai_client_lock = threading.Lock()
+
+
+class RouteChoice(BaseModel):
+    """Structured Gemini reply for route analysis."""
+    selected_route_index: int  # 1-based
+    reasoning: str
+
+
+# Route analysis model. 2.5-series models support implicit prompt caching; thinking is off
+# (as for the voice LLM) because this runs while the user waits for the first direction.
+ROUTE_ANALYSIS_MODEL = "gemini-2.5-flash"
+ROUTE_ANALYSIS_TIMEOUT_MS = 3000
+
+# Static route-analysis instructions. They go first and stay byte-identical across calls so
+# the shared prefix can be served from Gemini's implicit cache; per-request data follows.
+ROUTE_ANALYSIS_PROMPT = (
+    "You are a navigation assistant for a blind pedestrian.\n"
+    "Analyze the routes below from the origin to the destination.\n"
+    "Select the SAFEST route with fewer complex intersections and turns.\n"
+    "Return JSON with 'selected_route_index' (1-based) and 'reasoning'."
+)
+ROUTE_ANALYSIS_PROMPT_PART = types.Part.from_text(text=ROUTE_ANALYSIS_PROMPT)
+
+# Route analysis config (constant; built once at import). The schema constrains Gemini's
+# output so the reply can be used via response.parsed without any text cleanup.
+ROUTE_ANALYSIS_CONFIG = types.GenerateContentConfig(
+    response_mime_type="application/json",
+    response_schema=RouteChoice,
+    thinking_config=types.ThinkingConfig(thinking_budget=0),
+    # Hard deadline: the analysis is advisory, so a slow reply falls back to Google's first route
+    # rather than holding up navigation start
+    http_options=types.HttpOptions(timeout=ROUTE_ANALYSIS_TIMEOUT_MS),
+)
+
+
+def _get_genai_client(api_key: str) -> Client:
+    """Return the shared Gemini client, creating it on first use."""
+    global _genai_client
+    if _genai_client is None:
+        with _genai_client_lock:
+            if _genai_client is None:
+                _genai_client = Client(api_key=api_key)
+    return _genai_client
+
 
 class NavigationTool:
     def __init__(self):
@@ -38,7 +96,7 @@ class NavigationTool:
             logger.warning("GOOGLE_MAPS_API_KEY not found or empty in environment")
             self.client = None
         else:
-            self.client = googlemaps.Client(key=api_key)
+            self.client = googlemaps.Client(key=api_key, requests_session=_http_session)
         
         # Initialize Gemini Client for route analysis
         gemini_key = os.environ.get("GOOGLE_API_KEY")
@@ -46,7 +104,7 @@ class NavigationTool:
             logger.warning("GOOGLE_API_KEY not found (for Gemini)")
             self.genai_client = None
         else:
-            self.genai_client = Client(api_key=gemini_key)
+            self.genai_client = _get_genai_client(gemini_key)
         
         self.session = NavigationSession()
 
@@ -68,23 +126,7 @@ class NavigationTool:
 
         facing_str = ""
         if self._latest_heading is not None:
-            h = self._latest_heading
-            if h < 22.5 or h >= 337.5:
-                facing_str = " Facing north."
-            elif h < 67.5:
-                facing_str = " Facing north-east."
-            elif h < 112.5:
-                facing_str = " Facing east."
-            elif h < 157.5:
-                facing_str = " Facing south-east."
-            elif h < 202.5:
-                facing_str = " Facing south."
-            elif h < 247.5:
-                facing_str = " Facing south-west."
-            elif h < 292.5:
-                facing_str = " Facing west."
-            else:
-                facing_str = " Facing north-west."
+            facing_str = f" Facing {_bearing_to_cardinal(self._latest_heading)}."
 
         if self.client:
             try:
@@ -108,22 +150,7 @@ class NavigationTool:
         """Return current compass heading (0–360°, 0=north) or that heading is not available."""
         if self._latest_heading is None:
             return "Compass heading is not available. Make sure the app is open and has compass access."
-        h = self._latest_heading
-        if h < 22.5 or h >= 337.5:
-            return "You are facing north."
-        if h < 67.5:
-            return "You are facing north-east."
-        if h < 112.5:
-            return "You are facing east."
-        if h < 157.5:
-            return "You are facing south-east."
-        if h < 202.5:
-            return "You are facing south."
-        if h < 247.5:
-            return "You are facing south-west."
-        if h < 292.5:
-            return "You are facing west."
-        return "You are facing north-west."
+        return f"You are facing {_bearing_to_cardinal(self._latest_heading)}."
 
     @llm.function_tool(description="Start turn-by-turn navigation from an origin to a destination. Always use origin 'current location' unless the user explicitly gives a different start address (e.g. 'navigate me to X', 'take me to Y' → origin='current location', destination=X or Y).")
     async def start_navigation(self, origin: str, destination: str, mode: str = "walking") -> str:
@@ -169,28 +196,25 @@ class NavigationTool:
                         step_summaries = [s.get("html_instructions", "") for s in steps]
                         routes_data.append(f"Route {i+1}: {summary}, {duration}, {distance}. Steps: {step_summaries}")
                     
-                    prompt = f"""
-                    You are a navigation assistant for a blind pedestrian.
-                    Analyze these routes from {origin} to {destination}.
-                    Select the SAFEST route with fewer complex intersections and turns.
-                    Return JSON with 'selected_route_index' (1-based) and 'reasoning'.
-                    Routes: {routes_data}
-                    """
-                    
+                    route_part = types.Part.from_text(
+                        text=f"Origin: {origin}\nDestination: {destination}\nRoutes: {routes_data}"
+                    )
+
                     response = await asyncio.to_thread(
                         self.genai_client.models.generate_content,
-                        model="gemini-2.0-flash",
-                        contents=prompt,
-                        config=types.GenerateContentConfig(response_mime_type="application/json")
+                        model=ROUTE_ANALYSIS_MODEL,
+                        contents=[types.Content(role="user", parts=[ROUTE_ANALYSIS_PROMPT_PART, route_part])],
+                        config=ROUTE_ANALYSIS_CONFIG,
                     )
-                    
-                    import json
-                    analysis = json.loads(response.text)
-                    idx = analysis.get("selected_route_index", 1) - 1
+
+                    choice = response.parsed
+                    if not isinstance(choice, RouteChoice):
+                        choice = RouteChoice.model_validate_json(response.text)
+                    idx = choice.selected_route_index - 1
                     if 0 <= idx < len(directions_result):
                         selected_route = directions_result[idx]
-                        analysis_text = f" I selected this route because: {analysis.get('reasoning', 'it seems safer')}."
-                        logger.info(f"Gemini selected route {idx+1}: {analysis.get('reasoning')}")
+                        analysis_text = f" I selected this route because: {choice.reasoning or 'it seems safer'}."
+                        logger.info(f"Gemini selected route {idx+1}: {choice.reasoning}")
                         
                 except Exception as g_err:
                     logger.error(f"Gemini analysis failed, falling back to default route: {g_err}")
@@ -348,7 +372,7 @@ class NavigationTool:
 
         try:
             def _search():
-                resp = requests.post(url, json=payload, headers=headers, timeout=10)
+                resp = _http_session.post(url, json=payload, headers=headers, timeout=10)
                 resp.raise_for_status()
                 return resp.json()
 
@@ -417,7 +441,7 @@ class NavigationTool:
         }
         try:
             def _search():
-                resp = requests.post(url, json=payload, headers=headers, timeout=10)
+                resp = _http_session.post(url, json=payload, headers=headers, timeout=10)
                 resp.raise_for_status()
                 return resp.json()
 
@@ -1,5 +1,4 @@
 import 'dart:async';
-import 'dart:convert';
 import 'dart:math' as math;
 import 'dart:typed_data';
 import 'dart:ui' as ui;
@@ -733,8 +732,7 @@ class _CameraPreviewScreenState extends State<CameraPreviewScreen> {
         resized = await compute(_resizeObstacleImageIsolate, bytes);
       }
       if (resized != null && resized.isNotEmpty) {
-        final base64 = base64Encode(resized);
-        _voiceService.publishObstacleFrame(base64);
+        _voiceService.publishObstacleFrame(resized);
       }
     } catch (_) {
     } finally {
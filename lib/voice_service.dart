@@ -254,20 +254,20 @@ class VoiceService extends ChangeNotifier {
 
   static int _obstacleFramesSent = 0;
 
-  /// Publish a single camera frame (base64 JPEG) to agent.
+  /// Publish a single camera frame (raw JPEG bytes) to agent.
+  /// Sent as binary data, not base64/JSON, so the payload is the JPEG itself (~25% smaller).
   /// Payload must stay under 14KB for LiveKit reliable data (hard limit ~15KB).
-  void publishObstacleFrame(String base64Jpeg) {
+  void publishObstacleFrame(List<int> jpegBytes) {
     final room = _room;
     if (room == null) return;
-    final payload = utf8.encode('{"frame":"$base64Jpeg"}');
-    if (payload.length > 14 * 1024) {
-      debugPrint('VoiceService: obstacle frame too large (${payload.length} bytes > 14KB), skipping');
+    if (jpegBytes.length > 14 * 1024) {
+      debugPrint('VoiceService: obstacle frame too large (${jpegBytes.length} bytes > 14KB), skipping');
       return;
     }
-    _publishDataSafe(payload, _obstacleFrameTopic);
+    _publishDataSafe(jpegBytes, _obstacleFrameTopic);
     _obstacleFramesSent++;
     if (_obstacleFramesSent <= 2 || _obstacleFramesSent % 25 == 0) {
-      debugPrint('VoiceService: obstacle frame sent #$_obstacleFramesSent (${payload.length} bytes)');
+      debugPrint('VoiceService: obstacle frame sent #$_obstacleFramesSent (${jpegBytes.length} bytes)');
     }
   }
 
@@ -21,23 +21,15 @@ def _bearing_degrees(lat1: float, lon1: float, lat2: float, lon2: float) -> floa
     return (bearing + 360) % 360
 
 
+# 8-point compass names, one per 45° sector centered on each direction (index 0 = north)
+_CARDINAL_POINTS = ("north", "north-east", "east", "south-east", "south", "south-west", "west", "north-west")
+
+
 def _bearing_to_cardinal(bearing: float) -> str:
     """Convert bearing 0-360 to cardinal direction."""
-    if bearing < 22.5 or bearing >= 337.5:
-        return "north"
-    if bearing < 67.5:
-        return "north-east"
-    if bearing < 112.5:
-        return "east"
-    if bearing < 157.5:
-        return "south-east"
-    if bearing < 202.5:
-        return "south"
-    if bearing < 247.5:
-        return "south-west"
-    if bearing < 292.5:
-        return "west"
-    return "north-west"
+    if not math.isfinite(bearing):  # NaN/inf can't be bucketed (int() would raise)
+        return "an unknown direction"
+    return _CARDINAL_POINTS[int((bearing % 360 + 22.5) // 45) % 8]
 
 
 def _relative_direction(user_heading: float, target_bearing: float) -> str:
@@ -1,21 +1,33 @@
 """
 Obstacle detection for blind pedestrians.
 Uses OpenCV only (free, no API key): HOG person detector by default, or YOLOv8n ONNX if available.
-Receives camera frames (base64 JPEG), runs detection, calls on_obstacle(description, is_new) or on_clear().
+Receives camera frames (raw JPEG bytes, or base64 JPEG from older app builds), runs detection, calls on_obstacle(description, is_new) or on_clear().
 """
 
 import asyncio
 import base64
 import logging
 import os
+import threading
+import time
 from pathlib import Path
-from typing import Awaitable, Callable, Optional
+from typing import Awaitable, Callable, Optional, Union
 
 import cv2
 import numpy as np
 
 logger = logging.getLogger("obstacle")
 
+# LiveKit runs each agent job in its own process, so concurrent sessions already spread across
+# cores. OpenCV also sizes its internal thread pool to every core in each of those processes;
+# set OBSTACLE_CV_THREADS to cap it when several sessions share one machine.
+_cv_threads = os.environ.get("OBSTACLE_CV_THREADS", "").strip()
+if _cv_threads:
+    try:
+        cv2.setNumThreads(int(_cv_threads))
+    except ValueError:
+        logger.warning("Ignoring invalid OBSTACLE_CV_THREADS=%r", _cv_threads)
+
 # COCO class names (index 0-79) for YOLOv8
 COCO_NAMES = (
     "person", "bicycle", "car", "motorcycle", "airplane", "bus", "train",
@@ -55,17 +67,84 @@ OBSTACLE_CLASS_IDS = {
 CENTER_X_FRAC = (0.2, 0.8)   # middle 60% horizontally
 CENTER_Y_FRAC = (0.25, 1.0)  # lower 75% (skip sky)
 
+# Image budget: frames larger than this on the long edge are downscaled after decode.
+# YOLOv8n runs at 640x640 anyway and HOG cost grows with pixel count; the phone already
+# sends ~256px frames (lib/config.dart), so this mainly bounds full-resolution inputs.
+MAX_FRAME_EDGE = 640
 
-def _decode_frame(b64: str) -> Optional[np.ndarray]:
+# Near-duplicate frames (camera held still) reuse the previous *obstacle* verdict instead of re-running
+# detection. Frames match when the 8x8 average hashes of their path-ahead regions (CENTER_*_FRAC) differ
+# in at most DEDUPE_MAX_HAMMING of 64 bits and the verdict is no older than DEDUPE_MAX_AGE_S (the phone
+# sends a frame every ~800 ms). "Path clear" is never reused: a small object entering the path changes
+# only a few hash bits, so after a clear the detector always runs.
+DEDUPE_MAX_AGE_S = 1.0
+DEDUPE_MAX_HAMMING = 4
+
+# Opt-in: frames whose path-ahead region has less detail than OBSTACLE_MIN_FRAME_DETAIL (mean absolute
+# gradient of a 64x64 grayscale thumbnail, 0-255 scale) skip the detector and count as clear.
+# Off by default: low-contrast scenes (dusk, night, fog) with a person in the path can score below 1.0,
+# so only enable it with a threshold tuned on real frames. The score is logged at debug level.
+MIN_FRAME_DETAIL = 0.0
+_min_detail = os.environ.get("OBSTACLE_MIN_FRAME_DETAIL", "").strip()
+if _min_detail:
     try:
-        raw = base64.b64decode(b64)
-    except Exception:
-        return None
+        MIN_FRAME_DETAIL = float(_min_detail)
+    except ValueError:
+        logger.warning("Ignoring invalid OBSTACLE_MIN_FRAME_DETAIL=%r", _min_detail)
+
+
+def _decode_frame(frame: Union[bytes, str]) -> Optional[np.ndarray]:
+    """Decode a JPEG frame given as raw bytes or as a base64 string."""
+    if isinstance(frame, str):
+        try:
+            raw = base64.b64decode(frame)
+        except Exception:
+            return None
+    else:
+        raw = frame
     if len(raw) < 100:
         return None
     arr = np.frombuffer(raw, dtype=np.uint8)
     img = cv2.imdecode(arr, cv2.IMREAD_COLOR)
-    return img
+    if img is None:
+        return None
+    return _shrink_frame(img)
+
+
+def _shrink_frame(img: np.ndarray) -> np.ndarray:
+    """Downscale so the long edge is at most MAX_FRAME_EDGE; small frames are returned as-is."""
+    h, w = img.shape[:2]
+    longest = max(h, w)
+    if longest <= MAX_FRAME_EDGE:
+        return img
+    scale = MAX_FRAME_EDGE / longest
+    size = (max(1, round(w * scale)), max(1, round(h * scale)))
+    return cv2.resize(img, size, interpolation=cv2.INTER_AREA)
+
+
+def _average_hash(img: np.ndarray) -> int:
+    """64-bit perceptual hash: 8x8 grayscale thumbnail thresholded against its mean."""
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+    small = cv2.resize(gray, (8, 8), interpolation=cv2.INTER_AREA)
+    bits = np.packbits(small > small.mean())
+    return int.from_bytes(bits.tobytes(), "big")
+
+
+def _path_region(img: np.ndarray) -> np.ndarray:
+    """The "path ahead" crop (CENTER_X_FRAC x CENTER_Y_FRAC) of a frame, as a view."""
+    h, w = img.shape[:2]
+    return img[
+        int(h * CENTER_Y_FRAC[0]):int(h * CENTER_Y_FRAC[1]),
+        int(w * CENTER_X_FRAC[0]):int(w * CENTER_X_FRAC[1]),
+    ]
+
+
+def _frame_detail(region: np.ndarray) -> float:
+    """Cheap edge-density score for a grayscale path-ahead region."""
+    if region.size == 0:
+        return 0.0
+    small = cv2.resize(region, (64, 64), interpolation=cv2.INTER_AREA).astype(np.int16)
+    return float((np.abs(np.diff(small, axis=0)).mean() + np.abs(np.diff(small, axis=1)).mean()) / 2)
 
 
 def _center_region_contains(img_shape: tuple, box: list, scale: float = 1.0) -> bool:
@@ -79,12 +158,30 @@ def _center_region_contains(img_shape: tuple, box: list, scale: float = 1.0) ->
     return x_lo <= cx <= x_hi and y_lo <= cy <= y_hi
 
 
+# HOG people detector, built once and shared by every frame (see _get_hog)
+_hog: Optional[cv2.HOGDescriptor] = None
+_hog_lock = threading.Lock()
+
+
+def _get_hog() -> Optional[cv2.HOGDescriptor]:
+    """Return the shared HOG people detector, creating it on first use."""
+    global _hog
+    if _hog is None:
+        with _hog_lock:
+            if _hog is None:
+                try:
+                    hog = cv2.HOGDescriptor()
+                    hog.setSVMDetector(cv2.HOGDescriptor_getDefaultPeopleDetector())
+                except Exception:
+                    return None
+                _hog = hog
+    return _hog
+
+
 def _hog_detect_person(img: np.ndarray) -> Optional[tuple]:
     """Returns (description, ) if person in center region else None. Uses OpenCV HOG."""
-    try:
-        hog = cv2.HOGDescriptor()
-        hog.setSVMDetector(cv2.HOGDescriptor_getDefaultPeopleDetector())
-    except Exception:
+    hog = _get_hog()
+    if hog is None:
         return None
     h, w = img.shape[:2]
     (rects, _weights) = hog.detectMultiScale(img, winStride=(4, 4), padding=(8, 8), scale=1.05)
@@ -161,6 +258,10 @@ class ObstacleProcessor:
         self._running = False
         self._last_obstacle = False
         self._frames_processed = 0
+        self._frames_deduped = 0
+        self._frames_featureless = 0
+        # (path-region hash, monotonic time, result) of the last frame that actually ran the detector
+        self._last_verdict: Optional[tuple[int, float, Optional[tuple]]] = None
         self._load_model()
 
     def _load_model(self) -> None:
@@ -179,12 +280,13 @@ class ObstacleProcessor:
             logger.info("No yolov8n.onnx found (optional). Using OpenCV HOG person detector (person only).")
             self._use_hog = True
 
-    def put_frame(self, data_base64: str) -> None:
+    def put_frame(self, frame: Union[bytes, str]) -> None:
+        """Queue a JPEG frame (raw bytes, or a base64 string from older app builds)."""
         if not self._running:
             logger.debug("put_frame ignored (not running)")
             return
-        b64 = (data_base64 or "").strip().replace("\n", "").replace("\r", "")
-        if not b64:
+        # Base64 frames need no whitespace cleanup: b64decode discards newlines and other non-alphabet characters
+        if not frame:
             return
         try:
             if self._queue.full():
@@ -192,7 +294,7 @@ class ObstacleProcessor:
                     self._queue.get_nowait()
                 except asyncio.QueueEmpty:
                     pass
-            self._queue.put_nowait(("image/jpeg", b64))
+            self._queue.put_nowait(("image/jpeg", frame))
         except Exception as e:
             logger.debug("put_frame: %s", e)
 
@@ -212,7 +314,43 @@ class ObstacleProcessor:
             pass
         if self._task and not self._task.done():
             self._task.cancel()
-        logger.info("Obstacle processor stopped (processed %d frames)", self._frames_processed)
+        logger.info(
+            "Obstacle processor stopped (processed %d frames, %d reused previous verdict, %d featureless)",
+            self._frames_processed, self._frames_deduped, self._frames_featureless,
+        )
+
+    def _analyze(self, frame: Union[bytes, str]) -> tuple[Optional[np.ndarray], Optional[tuple]]:
+        """Decode and detect in a single worker-thread hop. Returns (img, result); img is None if undecodable or too small."""
+        img = _decode_frame(frame)
+        if img is None or len(img.shape) < 2 or img.size < 100:
+            return None, None
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+        region = _path_region(gray)
+        frame_hash = _average_hash(region) if region.size else 0
+        now = time.monotonic()
+        last = self._last_verdict
+        if (
+            last is not None
+            and last[2] is not None
+            and now - last[1] <= DEDUPE_MAX_AGE_S
+            and (frame_hash ^ last[0]).bit_count() <= DEDUPE_MAX_HAMMING
+        ):
+            self._frames_deduped += 1
+            return img, last[2]
+        if MIN_FRAME_DETAIL > 0 or logger.isEnabledFor(logging.DEBUG):
+            detail = _frame_detail(region)
+            logger.debug("frame detail %.2f (skip threshold %.2f)", detail, MIN_FRAME_DETAIL)
+            if detail < MIN_FRAME_DETAIL:
+                # Featureless path ahead (lens covered, blank sky or pavement). Not stored in _last_verdict:
+                # a clear that never ran the detector must not be reused for near-duplicate frames.
+                self._frames_featureless += 1
+                return img, None
+        if self._use_hog:
+            result = _hog_detect_person(img)
+        else:
+            result = _yolo_detect(self._net, img) if self._net else None
+        self._last_verdict = (frame_hash, now, result)
+        return img, result
 
     async def _loop(self) -> None:
         try:
@@ -221,21 +359,18 @@ class ObstacleProcessor:
                     item = await asyncio.wait_for(self._queue.get(), timeout=0.5)
                 except asyncio.TimeoutError:
                     continue
+                # Frames that queued up behind the one just analyzed are already stale; only the newest counts
+                while item is not None and not self._queue.empty():
+                    item = self._queue.get_nowait()
                 if item is None or not self._running:
                     break
-                _, b64 = item
-                img = await asyncio.to_thread(_decode_frame, b64)
+                _, frame = item
+                img, result = await asyncio.to_thread(self._analyze, frame)
                 if img is None:
-                    logger.debug("obstacle frame decode failed (b64 len=%d)", len(b64))
-                    continue
-                if len(img.shape) < 2 or img.size < 100:
+                    logger.debug("obstacle frame decode failed (payload len=%d)", len(frame))
                     continue
                 if self._frames_processed == 0 or self._frames_processed % 30 == 1:
                     logger.info("obstacle frame shape: %s (h=%d w=%d)", img.shape, img.shape[0], img.shape[1])
-                if self._use_hog:
-                    result = await asyncio.to_thread(_hog_detect_person, img)
-                else:
-                    result = await asyncio.to_thread(_yolo_detect, self._net, img) if self._net else None
                 self._frames_processed += 1
                 if self._frames_processed % 25 == 0:
                     logger.info("Obstacle pipeline alive: processed %d frames", self._frames_processed)
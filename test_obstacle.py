@@ -0,0 +1,86 @@
+"""
+Unit tests for ObstacleProcessor's near-duplicate verdict reuse (no camera, LiveKit or model needed).
+
+  uv run python -m pytest -q test_obstacle.py
+"""
+
+import cv2
+import numpy as np
+import pytest
+
+import obstacle
+
+
+def _scene() -> np.ndarray:
+    """256x192 textured street-like frame (the app's frame size)."""
+    rng = np.random.default_rng(0)
+    img = cv2.GaussianBlur(rng.integers(60, 200, (192, 256, 3), dtype=np.uint8), (0, 0), 3)
+    return np.ascontiguousarray(img)
+
+
+def _with_person(img: np.ndarray, w: int = 20, h: int = 50) -> np.ndarray:
+    """Copy of img with a dark person-sized block entering the lower centre."""
+    out = img.copy()
+    cx, bottom = img.shape[1] // 2, img.shape[0] - 10
+    out[bottom - h:bottom, cx - w // 2:cx + w // 2] = 20
+    return out
+
+
+def _jpeg(img: np.ndarray) -> bytes:
+    return cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, 90])[1].tobytes()
+
+
+@pytest.fixture
+def processor(monkeypatch):
+    """ObstacleProcessor on the HOG path, with the detector replaced by a dark-block check."""
+    calls = []
+
+    def fake_detect(img):
+        calls.append(img)
+        region = obstacle._path_region(cv2.cvtColor(img, cv2.COLOR_BGR2GRAY))
+        return ("person",) if (region < 40).any() else None
+
+    async def _noop(*_args):
+        pass
+
+    monkeypatch.setattr(obstacle, "_hog_detect_person", fake_detect)
+    proc = obstacle.ObstacleProcessor(on_obstacle=_noop, on_clear=_noop)
+    proc._use_hog = True
+    proc.calls = calls
+    return proc
+
+
+@pytest.mark.parametrize("w,h", [(20, 50), (30, 70), (40, 90)])
+def test_object_entering_center_after_clear_is_detected(processor, w, h):
+    scene = _scene()
+    _, first = processor._analyze(_jpeg(scene))
+    _, second = processor._analyze(_jpeg(_with_person(scene, w, h)))
+    assert first is None
+    assert second == ("person",)
+    assert len(processor.calls) == 2
+
+
+def test_clear_verdict_is_never_reused(processor):
+    scene = _jpeg(_scene())
+    processor._analyze(scene)
+    processor._analyze(scene)
+    assert len(processor.calls) == 2
+    assert processor._frames_deduped == 0
+
+
+def test_obstacle_verdict_is_reused_for_identical_frame(processor):
+    frame = _jpeg(_with_person(_scene()))
+    _, first = processor._analyze(frame)
+    _, second = processor._analyze(frame)
+    assert first == second == ("person",)
+    assert len(processor.calls) == 1
+    assert processor._frames_deduped == 1
+
+
+def test_hash_covers_path_region_only():
+    scene = _scene()
+    edited = scene.copy()
+    edited[:20, :] = 255  # sky strip above CENTER_Y_FRAC
+    gray = [cv2.cvtColor(f, cv2.COLOR_BGR2GRAY) for f in (scene, edited)]
+    hashes = [obstacle._average_hash(obstacle._path_region(g)) for g in gray]
+    assert hashes[0] == hashes[1]
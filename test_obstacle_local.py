@@ -65,10 +65,9 @@ def main() -> None:
                 last_check = now
                 frame_count += 1
 
-                import base64
+                # Raw JPEG bytes, as the app sends them
                 jpeg_bytes = cv2.imencode(".jpg", frame)[1].tobytes()
-                b64_str = base64.b64encode(jpeg_bytes).decode("ascii")
-                img = _decode_frame(b64_str)
+                img = _decode_frame(jpeg_bytes)
                 if img is None:
                     continue
                 if use_hog: